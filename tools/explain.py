@@ -1,28 +1,79 @@
 import random
 
+try:
+    import ahocorasick
+except ImportError:
+    # 未安装pyahocorasick时退回逐个关键词匹配
+    ahocorasick = None
+
 class ProblemExplainer:
-    def __init__(self):
-        self.knowledge_base = {
-            'geometry': {
-                'pattern': ['三角形', '面积', '勾股定理'],
-                'explanation': "几何问题一般需要：\n1. 画图辅助理解\n2. 确定已知条件\n3. 应用相关公式\n4. 分步计算验证"
-            },
-            'algebra': {
-                'pattern': ['方程', '变量', '求解'],
-                'explanation': "代数问题解法：\n1. 设定未知数\n2. 建立等量关系\n3. 解方程\n4. 验证解的正确性"
-            },
-            'probability': {
-                'pattern': ['概率', '可能性', '组合'],
-                'explanation': "概率问题步骤：\n1. 确定样本空间\n2. 计算有利事件\n3. 应用概率公式\n4. 考虑排列组合"
-            }
+    # 知识库和资源表为不可变的类级常量，所有实例共享，只构建一次
+    KNOWLEDGE_BASE = {
+        'geometry': {
+            'pattern': ('三角形', '面积', '勾股定理'),
+            'explanation': "几何问题一般需要：\n1. 画图辅助理解\n2. 确定已知条件\n3. 应用相关公式\n4. 分步计算验证"
+        },
+        'algebra': {
+            'pattern': ('方程', '变量', '求解'),
+            'explanation': "代数问题解法：\n1. 设定未知数\n2. 建立等量关系\n3. 解方程\n4. 验证解的正确性"
+        },
+        'probability': {
+            'pattern': ('概率', '可能性', '组合'),
+            'explanation': "概率问题步骤：\n1. 确定样本空间\n2. 计算有利事件\n3. 应用概率公式\n4. 考虑排列组合"
         }
-    
+    }
+    GENERAL_EXPLANATION = "通用解题思路：\n1. 仔细阅读题目\n2. 分解问题要素\n3. 尝试多种解法\n4. 检查计算过程"
+    # 资源列表预先拼接好，打印时无需再join
+    RESOURCES = {
+        'geometry': "1. 复习三角形性质\n2. 练习勾股定理应用题",
+        'algebra': "1. 练习一元二次方程\n2. 学习方程组解法",
+        'probability': "1. 复习排列组合\n2. 练习古典概型题",
+        'general': "1. 整理错题本\n2. 定时复习基础知识"
+    }
+
+    # 共享的Aho-Corasick自动机和字节串关键词表，首次使用时构建
+    _automaton = None
+    _byte_patterns = None
+
+    @classmethod
+    def _get_automaton(cls):
+        if ahocorasick is None:
+            return None
+        if cls._automaton is None:
+            automaton = ahocorasick.Automaton()
+            for category, data in cls.KNOWLEDGE_BASE.items():
+                for keyword in data['pattern']:
+                    automaton.add_word(keyword, category)
+            automaton.make_automaton()
+            cls._automaton = automaton
+        return cls._automaton
+
+    @classmethod
+    def _get_byte_patterns(cls):
+        # bytes.__contains__走C层的两路子串查找，比逐个str匹配更快
+        if cls._byte_patterns is None:
+            cls._byte_patterns = [
+                (category, tuple(keyword.encode('utf-8') for keyword in data['pattern']))
+                for category, data in cls.KNOWLEDGE_BASE.items()
+            ]
+        return cls._byte_patterns
+
     def analyze_question(self, question):
         question = question.lower()
-        for category, data in self.knowledge_base.items():
-            if any(keyword in question for keyword in data['pattern']):
-                return category, data['explanation']
-        return 'general', "通用解题思路：\n1. 仔细阅读题目\n2. 分解问题要素\n3. 尝试多种解法\n4. 检查计算过程"
+        automaton = self._get_automaton()
+        if automaton is not None:
+            # automaton.iter按出现位置产出匹配；为与回退路径保持一致，
+            # 收齐命中的类别后仍按KNOWLEDGE_BASE声明顺序取第一个
+            matched = {category for _, category in automaton.iter(question)}
+            for category in self.KNOWLEDGE_BASE:
+                if category in matched:
+                    return category, self.KNOWLEDGE_BASE[category]['explanation']
+        else:
+            question_bytes = question.encode('utf-8')
+            for category, keywords in self._get_byte_patterns():
+                if any(keyword in question_bytes for keyword in keywords):
+                    return category, self.KNOWLEDGE_BASE[category]['explanation']
+        return 'general', self.GENERAL_EXPLANATION
 
     def explain_problem(self, question):
         category, explanation = self.analyze_question(question)
@@ -34,13 +85,7 @@ class ProblemExplainer:
         self._show_additional_resources(category)
 
     def _show_additional_resources(self, category):
-        resources = {
-            'geometry': ["1. 复习三角形性质", "2. 练习勾股定理应用题"],
-            'algebra': ["1. 练习一元二次方程", "2. 学习方程组解法"],
-            'probability': ["1. 复习排列组合", "2. 练习古典概型题"],
-            'general': ["1. 整理错题本", "2. 定时复习基础知识"]
-        }
-        print("\n".join(resources.get(category, resources['general'])))
+        print(self.RESOURCES.get(category, self.RESOURCES['general']))
 
     def interactive_mode(self):
         while True:
@@ -1,269 +1,464 @@
 import os
+import re
 import json
+import sqlite3
 import datetime
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
+
+try:
+    # orjson的C解析器比stdlib json快数倍，迁移大文件时省时省内存
+    from orjson import loads as _loads
+except ImportError:
+    _loads = json.loads
+
+# 用于搜索查询的分词正则（匹配连续的字母/数字/汉字）
+_TOKEN_RE = re.compile(r"\w+", re.UNICODE)
 
 class NoteManager:
-    """笔记管理系统，用于创建、存储、分类和搜索学习笔记"""
-    
+    """笔记管理系统，用于创建、存储、分类和搜索学习笔记
+
+    笔记存储在单个SQLite数据库中，全文搜索由FTS5索引完成，
+    标签查询走tags表上的索引，增删改都是单条SQL语句。
+    """
+
     def __init__(self, storage_path: str = "notes"):
         """初始化笔记管理器
-        
+
         Args:
             storage_path: 笔记存储路径
         """
         self.storage_path = storage_path
-        self.notes_file = os.path.join(storage_path, "notes.json")
-        self.notes = []
-        
+        self.db_file = os.path.join(storage_path, "notes.db")
+
         # 确保存储目录存在
         if not os.path.exists(storage_path):
             os.makedirs(storage_path)
-            
-        # 加载现有笔记
-        self._load_notes()
-    
-    def _load_notes(self) -> None:
-        """从文件加载笔记"""
-        if os.path.exists(self.notes_file):
+
+        self.conn = sqlite3.connect(self.db_file)
+        self._create_tables()
+        self._migrate_legacy_files()
+
+    def _create_tables(self) -> None:
+        """创建数据表和全文索引"""
+        self.conn.executescript('''
+            CREATE TABLE IF NOT EXISTS notes (
+                id INTEGER PRIMARY KEY,
+                title TEXT NOT NULL,
+                content TEXT NOT NULL,
+                created_at TEXT NOT NULL,
+                updated_at TEXT NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS tags (
+                note_id INTEGER NOT NULL,
+                tag TEXT NOT NULL,
+                PRIMARY KEY (note_id, tag)
+            );
+            CREATE INDEX IF NOT EXISTS idx_tags_tag ON tags(tag);
+            CREATE TABLE IF NOT EXISTS meta (
+                key TEXT PRIMARY KEY,
+                value INTEGER NOT NULL
+            );
+            CREATE VIRTUAL TABLE IF NOT EXISTS notes_fts
+                USING fts5(title, content, tags, tokenize='unicode61');
+            CREATE VIRTUAL TABLE IF NOT EXISTS notes_fts_vocab
+                USING fts5vocab('notes_fts', 'row');
+        ''')
+        self.conn.commit()
+
+    def _migrate_legacy_files(self) -> None:
+        """将旧版notes.json/notes.jsonl数据一次性导入数据库"""
+        if self.conn.execute('SELECT 1 FROM notes LIMIT 1').fetchone():
+            return
+
+        legacy_notes = []
+        json_file = os.path.join(self.storage_path, "notes.json")
+        log_file = os.path.join(self.storage_path, "notes.jsonl")
+
+        if os.path.exists(json_file):
             try:
-                with open(self.notes_file, 'r', encoding='utf-8') as f:
-                    self.notes = json.load(f)
-            except json.JSONDecodeError:
-                print("笔记文件损坏，创建新的笔记文件")
-                self.notes = []
-    
-    def _save_notes(self) -> None:
-        """保存笔记到文件"""
-        with open(self.notes_file, 'w', encoding='utf-8') as f:
-            json.dump(self.notes, f, ensure_ascii=False, indent=2)
-    
+                with open(json_file, 'rb') as f:
+                    legacy_notes = _loads(f.read())
+            except ValueError:
+                print("旧版笔记文件损坏，跳过迁移")
+
+        if os.path.exists(log_file):
+            with open(log_file, 'rb') as f:
+                for line in f:
+                    line = line.strip()
+                    if not line:
+                        continue
+                    try:
+                        event = _loads(line)
+                    except ValueError:
+                        continue
+                    op = event.get("op")
+                    if op == "add":
+                        legacy_notes.append(event["note"])
+                    elif op == "update":
+                        note = event["note"]
+                        for i, existing in enumerate(legacy_notes):
+                            if existing["id"] == note["id"]:
+                                legacy_notes[i] = note
+                                break
+                    elif op == "del":
+                        legacy_notes = [n for n in legacy_notes
+                                        if n["id"] != event["id"]]
+
+        if not legacy_notes:
+            return
+
+        for note in legacy_notes:
+            self._insert_note(note)
+        self.conn.commit()
+
+        # 迁移完成后保留原文件作为备份
+        if os.path.exists(json_file):
+            os.replace(json_file, json_file + ".bak")
+        if os.path.exists(log_file):
+            os.remove(log_file)
+        print(f"已将 {len(legacy_notes)} 条旧版笔记迁移到数据库")
+
+    def _allocate_note_id(self) -> int:
+        """分配下一个笔记id（meta表中的单调计数器，删除后也不复用）
+
+        计数器与笔记插入在同一事务中提交；旧库没有计数器时
+        从当前最大id起播。
+        """
+        note_id = self.conn.execute(
+            "SELECT COALESCE((SELECT value FROM meta WHERE key='next_note_id'), "
+            "(SELECT COALESCE(MAX(id), 0) + 1 FROM notes))").fetchone()[0]
+        self.conn.execute(
+            "INSERT INTO meta (key, value) VALUES ('next_note_id', ?) "
+            "ON CONFLICT(key) DO UPDATE SET value=excluded.value",
+            (note_id + 1,))
+        return note_id
+
+    def _insert_note(self, note: Dict[str, Any]) -> None:
+        """将一条笔记写入notes、tags和全文索引（不提交事务）"""
+        self.conn.execute(
+            'INSERT INTO notes (id, title, content, created_at, updated_at) VALUES (?,?,?,?,?)',
+            (note["id"], note["title"], note["content"],
+             note["created_at"], note["updated_at"]))
+        self.conn.executemany(
+            'INSERT OR IGNORE INTO tags (note_id, tag) VALUES (?,?)',
+            [(note["id"], tag) for tag in note["tags"]])
+        self.conn.execute(
+            'INSERT INTO notes_fts (rowid, title, content, tags) VALUES (?,?,?,?)',
+            (note["id"], note["title"], note["content"], " ".join(note["tags"])))
+
+    def _row_to_note(self, row) -> Dict[str, Any]:
+        """将notes表的一行转换为笔记字典"""
+        note_id, title, content, created_at, updated_at = row
+        tags = [tag for (tag,) in self.conn.execute(
+            'SELECT tag FROM tags WHERE note_id=? ORDER BY tag', (note_id,))]
+        return {
+            "id": note_id,
+            "title": title,
+            "content": content,
+            "tags": tags,
+            "created_at": created_at,
+            "updated_at": updated_at
+        }
+
+    def _get_note(self, note_id: int) -> Optional[Dict[str, Any]]:
+        """按id读取单条笔记"""
+        row = self.conn.execute(
+            'SELECT id, title, content, created_at, updated_at FROM notes WHERE id=?',
+            (note_id,)).fetchone()
+        return self._row_to_note(row) if row else None
+
     def add_note(self, title: str, content: str, tags: List[str] = None) -> Dict[str, Any]:
         """添加新笔记
-        
+
         Args:
             title: 笔记标题
             content: 笔记内容
             tags: 笔记标签列表
-            
+
         Returns:
             新创建的笔记
         """
         if tags is None:
             tags = []
-            
+
+        now = datetime.datetime.now().isoformat(sep=' ', timespec='seconds')
+        note_id = self._allocate_note_id()
         note = {
-            "id": len(self.notes) + 1,
+            "id": note_id,
             "title": title,
             "content": content,
             "tags": tags,
-            "created_at": datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
-            "updated_at": datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+            "created_at": now,
+            "updated_at": now
         }
-        
-        self.notes.append(note)
-        self._save_notes()
+
+        self._insert_note(note)
+        self.conn.commit()
         return note
-    
+
     def get_all_notes(self) -> List[Dict[str, Any]]:
         """获取所有笔记
-        
+
         Returns:
             笔记列表
         """
-        return self.notes
-    
+        rows = self.conn.execute(
+            'SELECT id, title, content, created_at, updated_at FROM notes ORDER BY id')
+        return [self._row_to_note(row) for row in rows]
+
+    # 单个token命中的词项过多时放弃索引路径，改走全表扫描
+    _MAX_TERMS_PER_TOKEN = 500
+
+    def _substring_match_expr(self, tokens: List[str]) -> Optional[str]:
+        """把查询token组装成对子串匹配完备的MATCH表达式
+
+        每个token在词表中枚举所有包含它的词项，用词项的OR组走索引。
+        词表里的词项经过unicode61的大小写/变音折叠，且下划线等字符被当作
+        分隔符，和Python的\\w规则并不完全一致——所以探不到词项只说明
+        索引帮不上忙，不能断定无匹配。返回None表示退回全表扫描
+        （词项太多或探查不到），由既有的子串校验保证语义。
+        """
+        groups = []
+        for token in tokens:
+            rows = self.conn.execute(
+                'SELECT term FROM notes_fts_vocab WHERE instr(term, ?) > 0 LIMIT ?',
+                (token, self._MAX_TERMS_PER_TOKEN + 1)).fetchall()
+            if not rows or len(rows) > self._MAX_TERMS_PER_TOKEN:
+                return None
+            groups.append('(' + ' OR '.join(
+                '"{}"'.format(row[0].replace('"', '""')) for row in rows) + ')')
+        return ' AND '.join(groups)
+
     def search_notes(self, query: str) -> List[Dict[str, Any]]:
         """搜索笔记
-        
+
         Args:
             query: 搜索关键词
-            
+
         Returns:
             匹配的笔记列表
         """
         query = query.lower()
+        tokens = _TOKEN_RE.findall(query)
+
+        # unicode61把一整段中文切成单个词项，前缀匹配找不到词项中段的子串；
+        # 因此先在词表里枚举"包含查询token"的词项（词项数远小于全表），
+        # 再用这些词项的OR组合走FTS索引，保证召回与子串匹配一致
+        match = self._substring_match_expr(tokens) if tokens else None
+
+        if match is not None:
+            rows = self.conn.execute(
+                'SELECT n.id, n.title, n.content, n.created_at, n.updated_at '
+                'FROM notes n JOIN notes_fts f ON n.id = f.rowid '
+                'WHERE notes_fts MATCH ? ORDER BY n.id', (match,))
+        else:
+            rows = self.conn.execute(
+                'SELECT id, title, content, created_at, updated_at FROM notes ORDER BY id')
+
+        # 对候选集做子串校验，保持与全文子串匹配一致的语义
         results = []
-        
-        for note in self.notes:
-            if (query in note["title"].lower() or 
+        for row in rows:
+            note = self._row_to_note(row)
+            if (query in note["title"].lower() or
                 query in note["content"].lower() or
                 any(query in tag.lower() for tag in note["tags"])):
                 results.append(note)
-                
+
         return results
-    
+
     def get_notes_by_tag(self, tag: str) -> List[Dict[str, Any]]:
         """按标签获取笔记
-        
+
         Args:
             tag: 标签名称
-            
+
         Returns:
             包含指定标签的笔记列表
         """
-        return [note for note in self.notes if tag in note["tags"]]
-    
+        rows = self.conn.execute(
+            'SELECT n.id, n.title, n.content, n.created_at, n.updated_at '
+            'FROM notes n JOIN tags t ON n.id = t.note_id '
+            'WHERE t.tag=? ORDER BY n.id', (tag,))
+        return [self._row_to_note(row) for row in rows]
+
     def update_note(self, note_id: int, title: str = None, content: str = None, tags: List[str] = None) -> Dict[str, Any]:
         """更新笔记
-        
+
         Args:
             note_id: 笔记ID
             title: 新标题（可选）
             content: 新内容（可选）
             tags: 新标签列表（可选）
-            
+
         Returns:
             更新后的笔记，如果笔记不存在则返回None
         """
-        for note in self.notes:
-            if note["id"] == note_id:
-                if title is not None:
-                    note["title"] = title
-                if content is not None:
-                    note["content"] = content
-                if tags is not None:
-                    note["tags"] = tags
-                    
-                note["updated_at"] = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-                self._save_notes()
-                return note
-                
-        return None
-    
+        note = self._get_note(note_id)
+        if note is None:
+            return None
+
+        if title is not None:
+            note["title"] = title
+        if content is not None:
+            note["content"] = content
+        if tags is not None:
+            note["tags"] = tags
+        note["updated_at"] = datetime.datetime.now().isoformat(sep=' ', timespec='seconds')
+
+        self.conn.execute(
+            'UPDATE notes SET title=?, content=?, updated_at=? WHERE id=?',
+            (note["title"], note["content"], note["updated_at"], note_id))
+        if tags is not None:
+            self.conn.execute('DELETE FROM tags WHERE note_id=?', (note_id,))
+            self.conn.executemany(
+                'INSERT OR IGNORE INTO tags (note_id, tag) VALUES (?,?)',
+                [(note_id, tag) for tag in note["tags"]])
+        self.conn.execute(
+            'UPDATE notes_fts SET title=?, content=?, tags=? WHERE rowid=?',
+            (note["title"], note["content"], " ".join(note["tags"]), note_id))
+        self.conn.commit()
+        return note
+
     def delete_note(self, note_id: int) -> bool:
         """删除笔记
-        
+
         Args:
             note_id: 笔记ID
-            
+
         Returns:
             是否成功删除
         """
-        for i, note in enumerate(self.notes):
-            if note["id"] == note_id:
-                del self.notes[i]
-                self._save_notes()
-                return True
-                
-        return False
-    
+        cursor = self.conn.execute('DELETE FROM notes WHERE id=?', (note_id,))
+        deleted = cursor.rowcount > 0
+        if deleted:
+            self.conn.execute('DELETE FROM tags WHERE note_id=?', (note_id,))
+            self.conn.execute('DELETE FROM notes_fts WHERE rowid=?', (note_id,))
+        self.conn.commit()
+        return deleted
+
     def get_tags_summary(self) -> Dict[str, int]:
         """获取标签统计
-        
+
         Returns:
             标签及其出现次数的字典
         """
-        tags_count = {}
-        
-        for note in self.notes:
-            for tag in note["tags"]:
-                if tag in tags_count:
-                    tags_count[tag] += 1
-                else:
-                    tags_count[tag] = 1
-                    
-        return tags_count
+        return dict(self.conn.execute(
+            'SELECT tag, COUNT(*) FROM tags GROUP BY tag'))
+
+# 菜单预先拼成一个字符串，每轮只需一次写出
+_MENU = ("\n===== 笔记管理系统 =====\n"
+         "1. 添加笔记\n"
+         "2. 查看所有笔记\n"
+         "3. 搜索笔记\n"
+         "4. 按标签查看笔记\n"
+         "5. 更新笔记\n"
+         "6. 删除笔记\n"
+         "7. 查看标签统计\n"
+         "0. 退出\n"
+         "\n请选择操作: ")
 
 def interactive_mode():
     """交互式笔记管理"""
     note_manager = NoteManager()
-    
+
+    def add_note():
+        title = input("请输入笔记标题: ")
+        content = input("请输入笔记内容: ")
+        tags_input = input("请输入笔记标签（用逗号分隔）: ")
+        tags = [tag.strip() for tag in tags_input.split(",") if tag.strip()]
+
+        note = note_manager.add_note(title, content, tags)
+        print(f"笔记已添加，ID: {note['id']}")
+
+    def list_notes():
+        notes = note_manager.get_all_notes()
+        if not notes:
+            print("没有笔记")
+        else:
+            print("\n所有笔记:")
+            for note in notes:
+                print(f"ID: {note['id']}, 标题: {note['title']}, 标签: {', '.join(note['tags'])}")
+
+    def search_notes():
+        query = input("请输入搜索关键词: ")
+        results = note_manager.search_notes(query)
+
+        if not results:
+            print("没有找到匹配的笔记")
+        else:
+            print(f"\n找到 {len(results)} 条匹配的笔记:")
+            for note in results:
+                print(f"ID: {note['id']}, 标题: {note['title']}, 标签: {', '.join(note['tags'])}")
+
+    def notes_by_tag():
+        tag = input("请输入标签: ")
+        notes = note_manager.get_notes_by_tag(tag)
+
+        if not notes:
+            print(f"没有包含标签 '{tag}' 的笔记")
+        else:
+            print(f"\n包含标签 '{tag}' 的笔记:")
+            for note in notes:
+                print(f"ID: {note['id']}, 标题: {note['title']}")
+
+    def update_note():
+        note_id = int(input("请输入要更新的笔记ID: "))
+        title = input("请输入新标题（留空保持不变）: ")
+        content = input("请输入新内容（留空保持不变）: ")
+        tags_input = input("请输入新标签（用逗号分隔，留空保持不变）: ")
+
+        title = title if title else None
+        content = content if content else None
+        tags = [tag.strip() for tag in tags_input.split(",") if tag.strip()] if tags_input else None
+
+        updated_note = note_manager.update_note(note_id, title, content, tags)
+
+        if updated_note:
+            print("笔记已更新")
+        else:
+            print(f"未找到ID为 {note_id} 的笔记")
+
+    def delete_note():
+        note_id = int(input("请输入要删除的笔记ID: "))
+        success = note_manager.delete_note(note_id)
+
+        if success:
+            print("笔记已删除")
+        else:
+            print(f"未找到ID为 {note_id} 的笔记")
+
+    def tags_summary():
+        summary = note_manager.get_tags_summary()
+
+        if not summary:
+            print("没有标签")
+        else:
+            print("\n标签统计:")
+            for tag, count in sorted(summary.items(), key=lambda x: x[1], reverse=True):
+                print(f"{tag}: {count}条笔记")
+
+    handlers = {
+        "1": add_note,
+        "2": list_notes,
+        "3": search_notes,
+        "4": notes_by_tag,
+        "5": update_note,
+        "6": delete_note,
+        "7": tags_summary,
+    }
+
     while True:
-        print("\n===== 笔记管理系统 =====")
-        print("1. 添加笔记")
-        print("2. 查看所有笔记")
-        print("3. 搜索笔记")
-        print("4. 按标签查看笔记")
-        print("5. 更新笔记")
-        print("6. 删除笔记")
-        print("7. 查看标签统计")
-        print("0. 退出")
-        
-        choice = input("\n请选择操作: ")
-        
-        if choice == "1":
-            title = input("请输入笔记标题: ")
-            content = input("请输入笔记内容: ")
-            tags_input = input("请输入笔记标签（用逗号分隔）: ")
-            tags = [tag.strip() for tag in tags_input.split(",") if tag.strip()]
-            
-            note = note_manager.add_note(title, content, tags)
-            print(f"笔记已添加，ID: {note['id']}")
-            
-        elif choice == "2":
-            notes = note_manager.get_all_notes()
-            if not notes:
-                print("没有笔记")
-            else:
-                print("\n所有笔记:")
-                for note in notes:
-                    print(f"ID: {note['id']}, 标题: {note['title']}, 标签: {', '.join(note['tags'])}")
-                    
-        elif choice == "3":
-            query = input("请输入搜索关键词: ")
-            results = note_manager.search_notes(query)
-            
-            if not results:
-                print("没有找到匹配的笔记")
-            else:
-                print(f"\n找到 {len(results)} 条匹配的笔记:")
-                for note in results:
-                    print(f"ID: {note['id']}, 标题: {note['title']}, 标签: {', '.join(note['tags'])}")
-                    
-        elif choice == "4":
-            tag = input("请输入标签: ")
-            notes = note_manager.get_notes_by_tag(tag)
-            
-            if not notes:
-                print(f"没有包含标签 '{tag}' 的笔记")
-            else:
-                print(f"\n包含标签 '{tag}' 的笔记:")
-                for note in notes:
-                    print(f"ID: {note['id']}, 标题: {note['title']}")
-                    
-        elif choice == "5":
-            note_id = int(input("请输入要更新的笔记ID: "))
-            title = input("请输入新标题（留空保持不变）: ")
-            content = input("请输入新内容（留空保持不变）: ")
-            tags_input = input("请输入新标签（用逗号分隔，留空保持不变）: ")
-            
-            title = title if title else None
-            content = content if content else None
-            tags = [tag.strip() for tag in tags_input.split(",") if tag.strip()] if tags_input else None
-            
-            updated_note = note_manager.update_note(note_id, title, content, tags)
-            
-            if updated_note:
-                print("笔记已更新")
-            else:
-                print(f"未找到ID为 {note_id} 的笔记")
-                
-        elif choice == "6":
-            note_id = int(input("请输入要删除的笔记ID: "))
-            success = note_manager.delete_note(note_id)
-            
-            if success:
-                print("笔记已删除")
-            else:
-                print(f"未找到ID为 {note_id} 的笔记")
-                
-        elif choice == "7":
-            tags_summary = note_manager.get_tags_summary()
-            
-            if not tags_summary:
-                print("没有标签")
-            else:
-                print("\n标签统计:")
-                for tag, count in sorted(tags_summary.items(), key=lambda x: x[1], reverse=True):
-                    print(f"{tag}: {count}条笔记")
-                    
-        elif choice == "0":
+        choice = input(_MENU)
+
+        if choice == "0":
             print("感谢使用笔记管理系统！")
             break
-            
+
+        handler = handlers.get(choice)
+        if handler:
+            handler()
         else:
             print("无效的选择，请重试")
 
 if __name__ == "__main__":
-    interactive_mode() 
\ No newline at end of file
+    interactive_mode()
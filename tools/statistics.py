@@ -1,12 +1,21 @@
 import sqlite3
-import pandas as pd
 from datetime import datetime
 
 class WrongQuestionManager:
+    # 预置SQL语句，避免在调用点反复拼接
+    _UPSERT_QUESTION = ('INSERT INTO questions (question, subject, last_error) VALUES (?,?,?) '
+                        'ON CONFLICT(question) DO UPDATE SET '
+                        'error_count=error_count+1, last_error=excluded.last_error')
+
     def __init__(self):
         self.conn = sqlite3.connect('wrong_questions.db')
+        # 按列名取值，不依赖表结构中的列顺序
+        self.conn.row_factory = sqlite3.Row
+        # WAL+NORMAL免去每次commit的fsync，交互式写入场景下这是大头
+        self.conn.executescript(
+            'PRAGMA journal_mode=WAL; PRAGMA synchronous=NORMAL; PRAGMA temp_store=MEMORY;')
         self._create_table()
-    
+
     def _create_table(self):
         self.conn.execute('''CREATE TABLE IF NOT EXISTS questions
                           (id INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -14,47 +23,59 @@ class WrongQuestionManager:
                           subject TEXT,
                           error_count INTEGER DEFAULT 1,
                           last_error DATE)''')
-    
+        self.conn.execute(
+            'CREATE UNIQUE INDEX IF NOT EXISTS idx_q ON questions(question)')
+
     def add_question(self, question, subject):
-        check = self.conn.execute('SELECT * FROM questions WHERE question=?', (question,)).fetchone()
-        if check:
-            new_count = check[3] + 1
-            self.conn.execute('UPDATE questions SET error_count=?, last_error=? WHERE id=?',
-                            (new_count, datetime.now().date(), check[0]))
-        else:
-            self.conn.execute('INSERT INTO questions (question, subject, last_error) VALUES (?,?,?)',
-                             (question, subject, datetime.now().date()))
+        # UPSERT一条语句完成查重+插入/计数，只走一次索引查找
+        self.conn.execute(self._UPSERT_QUESTION,
+                          (question, subject, datetime.now().date()))
         self.conn.commit()
     
     def show_statistics(self):
-        df = pd.read_sql('SELECT * FROM questions', self.conn)
-        if df.empty:
+        totals = self.conn.execute(
+            'SELECT COUNT(*) AS count, SUM(error_count) AS errors FROM questions').fetchone()
+        if not totals['count']:
             print("暂无错题记录")
             return
-        
+
         print("\n=== 错题统计 ===")
-        print(f"总错题数: {len(df)}")
-        print(f"总错误次数: {df['error_count'].sum()}")
-        
+        print(f"总错题数: {totals['count']}")
+        print(f"总错误次数: {totals['errors']}")
+
         print("\n=== 按学科统计 ===")
-        print(df.groupby('subject')['error_count'].agg(['count', 'sum']))
-        
+        print("{:<10} {:>6} {:>6}".format("学科", "题数", "次数"))
+        for row in self.conn.execute(
+                'SELECT subject, COUNT(*) AS count, SUM(error_count) AS errors '
+                'FROM questions GROUP BY subject'):
+            print("{:<10} {:>6} {:>6}".format(row['subject'], row['count'], row['errors']))
+
         print("\n=== 最近错题 ===")
-        print(df.sort_values('last_error', ascending=False).head(5)[['question', 'last_error']])
+        for row in self.conn.execute(
+                'SELECT question, last_error FROM questions ORDER BY last_error DESC LIMIT 5'):
+            print(f"[{row['last_error']}] {row['question']}")
+
+    # 菜单预先拼成一个字符串，每轮只需一次写出
+    _MENU = "\n1. 添加错题\n2. 查看统计\n3. 退出\n请选择操作: "
+
+    def _record_question(self):
+        question = input("输入错题内容: ")
+        subject = input("所属学科: ")
+        self.add_question(question, subject)
+        print("已记录！")
 
     def run(self):
+        handlers = {
+            '1': self._record_question,
+            '2': self.show_statistics,
+        }
         while True:
-            print("\n1. 添加错题\n2. 查看统计\n3. 退出")
-            choice = input("请选择操作: ")
-            if choice == '1':
-                question = input("输入错题内容: ")
-                subject = input("所属学科: ")
-                self.add_question(question, subject)
-                print("已记录！")
-            elif choice == '2':
-                self.show_statistics()
-            elif choice == '3':
+            choice = input(self._MENU)
+            if choice == '3':
                 break
+            handler = handlers.get(choice)
+            if handler:
+                handler()
 
 if __name__ == "__main__":
     manager = WrongQuestionManager()
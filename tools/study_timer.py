@@ -1,11 +1,71 @@
 import os
+import sys
 import json
 import time
+import functools
+import array
+import bisect
+import asyncio
 import datetime
+import tempfile
 import threading
 import platform
+import subprocess
+from operator import itemgetter
 from typing import Dict, List, Any, Optional
 
+try:
+    # orjson的C序列化/解析比stdlib json快数倍，文件大了差距明显
+    import orjson
+    _dumps = orjson.dumps
+    def _dumps_pretty(obj) -> bytes:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+    _loads = orjson.loads
+except ImportError:
+    def _dumps(obj) -> bytes:
+        return json.dumps(obj, ensure_ascii=False).encode('utf-8')
+    def _dumps_pretty(obj) -> bytes:
+        return json.dumps(obj, ensure_ascii=False, indent=2).encode('utf-8')
+    _loads = json.loads
+
+def _atomic_write(path: str, data: bytes) -> None:
+    """先写临时文件再os.replace，进程中途被杀也不会留下半截文件"""
+    directory = os.path.dirname(path) or "."
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".tmp-", suffix=".json")
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+    except Exception:
+        os.unlink(tmp_path)
+        raise
+
+# 按整秒缓存的当前时间字符串：同一秒内的多次取时只做一次strftime
+_TS_CACHE = [0, ""]
+
+def _now_str() -> str:
+    """当前时间的"%Y-%m-%d %H:%M:%S"字符串（秒级缓存）"""
+    now = int(time.time())
+    if now != _TS_CACHE[0]:
+        _TS_CACHE[:] = [now, time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(now))]
+    return _TS_CACHE[1]
+
+# 以 (mtime_ns, size) 为键的文件解析缓存：文件未变时直接复用上次的解析结果
+_FILE_CACHE: Dict[str, tuple] = {}
+
+def _load_json_cached(path: str) -> Any:
+    """读取并解析JSON文件，文件未修改时命中缓存免去重复解析"""
+    stat = os.stat(path)
+    key = (stat.st_mtime_ns, stat.st_size)
+    cached = _FILE_CACHE.get(path)
+    if cached is not None and cached[0] == key:
+        return cached[1]
+
+    with open(path, 'rb') as f:
+        data = _loads(f.read())
+    _FILE_CACHE[path] = (key, data)
+    return data
+
 class StudyTimer:
     """学习计时器，用于管理学习时间和休息时间"""
     
@@ -17,60 +77,146 @@ class StudyTimer:
         """
         self.storage_path = storage_path
         self.sessions_file = os.path.join(storage_path, "sessions.json")
+        # 追加式日志：每次结束会话只写一行，避免全量重写sessions.json
+        self.sessions_log_file = self.sessions_file + ".ndjson"
         self.config_file = os.path.join(storage_path, "config.json")
-        self.sessions = []
+        # 会话与配置都按需加载：构造时不触碰磁盘
+        self._sessions: Optional[List[Dict[str, Any]]] = None
+        self._config: Optional[Dict[str, Any]] = None
         self.current_session = None
-        self.timer_thread = None
         self.running = False
         self.paused = False
-        self.elapsed_seconds = 0
-        
-        # 默认配置
-        self.config = {
+        # 已学习时长按需计算：_accumulated累计暂停前的时长，
+        # _monotonic_start记录最近一次开始/恢复的单调时钟
+        self._accumulated = 0.0
+        self._monotonic_start = 0.0
+        self._notify_timer = None
+        self._last_config_data = None
+        self._notify = self._resolve_notifier()
+        # 会话按列存放（SoA布局）：数值列用紧凑的array，字符串列用list，
+        # 统计时用bisect定位时间窗口，避免每次调用都对全部start_time做strptime
+        self._session_epochs = array.array('q')
+        self._session_durations = array.array('q')
+        self._session_dates: List[str] = []
+        self._session_subjects: List[str] = []
+        # 小写主题 -> 会话下标的倒排索引，按主题查询时不再全表扫描
+        self._subject_index: Dict[str, List[int]] = {}
+        self._stats_cache = None
+        # 下一个会话id，首次加载时根据已有数据算一次
+        self._next_id: Optional[int] = None
+
+    @property
+    def sessions(self) -> List[Dict[str, Any]]:
+        """会话列表，首次访问时才从磁盘加载"""
+        if self._sessions is None:
+            self._load_sessions()
+        return self._sessions
+
+    @property
+    def config(self) -> Dict[str, Any]:
+        """配置字典，首次访问时才从磁盘加载"""
+        if self._config is None:
+            self._load_config()
+        return self._config
+
+    def _load_sessions(self) -> None:
+        """从快照与追加日志加载会话（浅拷贝缓存结果，避免实例间共享）"""
+        self._sessions = []
+        if os.path.exists(self.sessions_file):
+            try:
+                self._sessions = list(_load_json_cached(self.sessions_file))
+            except ValueError:
+                print("会话文件损坏，创建新的会话文件")
+                self._sessions = []
+
+        # 合并追加日志中尚未合入快照的会话
+        if os.path.exists(self.sessions_log_file):
+            with open(self.sessions_log_file, 'rb') as f:
+                for line in f:
+                    line = line.strip()
+                    if line:
+                        self._sessions.append(_loads(line))
+
+        for session in self._sessions:
+            self._index_session(session)
+        self._next_id = max(
+            (session.get("id", 0) for session in self._sessions), default=0) + 1
+
+    def _load_config(self) -> None:
+        """加载配置，缺失的键用默认值补齐"""
+        self._config = {
             "study_duration": 25 * 60,  # 25分钟
             "short_break": 5 * 60,      # 5分钟
             "long_break": 15 * 60,      # 15分钟
             "sessions_before_long_break": 4,
             "notification_enabled": True
         }
-        
-        # 确保存储目录存在
-        if not os.path.exists(storage_path):
-            os.makedirs(storage_path)
-            
-        # 加载现有数据
-        self._load_data()
-    
-    def _load_data(self) -> None:
-        """从文件加载会话和配置"""
-        # 加载会话
-        if os.path.exists(self.sessions_file):
-            try:
-                with open(self.sessions_file, 'r', encoding='utf-8') as f:
-                    self.sessions = json.load(f)
-            except json.JSONDecodeError:
-                print("会话文件损坏，创建新的会话文件")
-                self.sessions = []
-        
-        # 加载配置
         if os.path.exists(self.config_file):
             try:
-                with open(self.config_file, 'r', encoding='utf-8') as f:
-                    loaded_config = json.load(f)
-                    # 更新默认配置
-                    self.config.update(loaded_config)
-            except json.JSONDecodeError:
+                self._config.update(_load_json_cached(self.config_file))
+            except ValueError:
                 print("配置文件损坏，使用默认配置")
-    
+
+    def _ensure_storage_dir(self) -> None:
+        """首次写入时才创建存储目录"""
+        os.makedirs(self.storage_path, exist_ok=True)
+
+    def _index_session(self, session: Dict[str, Any]) -> None:
+        """将会话的时间/时长/主题登记到统计用的各列中（每个会话只解析一次）"""
+        # 主题只有少数几个取值，intern后所有会话共享同一份字符串对象
+        session["subject"] = sys.intern(session["subject"])
+        epoch = session.get("start_epoch")
+        if epoch is None:
+            # 旧版数据只有字符串时间戳，解析一次后回填epoch字段
+            start = datetime.datetime.fromisoformat(session["start_time"])
+            epoch = int(start.timestamp())
+            session["start_epoch"] = epoch
+        self._session_epochs.append(epoch)
+        self._session_durations.append(int(session["duration"]))
+        self._session_dates.append(sys.intern(session["start_time"][:10]))
+        self._session_subjects.append(session["subject"])
+        self._subject_index.setdefault(session["subject"].lower(), []).append(
+            len(self._session_subjects) - 1)
+        self._stats_cache = None
+
     def _save_sessions(self) -> None:
-        """保存会话到文件"""
-        with open(self.sessions_file, 'w', encoding='utf-8') as f:
-            json.dump(self.sessions, f, ensure_ascii=False, indent=2)
-    
+        """全量重写会话快照并清空追加日志（仅在压实时使用）"""
+        self._ensure_storage_dir()
+        # 快照只供程序读取，省掉缩进；需要可读导出用export_pretty
+        _atomic_write(self.sessions_file, _dumps(self.sessions))
+        if os.path.exists(self.sessions_log_file):
+            os.remove(self.sessions_log_file)
+
+    def export_pretty(self, path: str) -> None:
+        """把全部会话以带缩进的JSON导出到指定文件（供人工查看）"""
+        _atomic_write(path, _dumps_pretty(self.sessions))
+
+    def _append_session(self, session: Dict[str, Any]) -> None:
+        """把单个会话追加到日志文件，写入量与历史会话数无关"""
+        self._ensure_storage_dir()
+        with open(self.sessions_log_file, 'ab') as f:
+            f.write(_dumps(session) + b'\n')
+        self._maybe_compact()
+
+    def _maybe_compact(self) -> None:
+        """追加日志明显大于快照时合并回sessions.json（LSM式压实）"""
+        try:
+            log_size = os.path.getsize(self.sessions_log_file)
+            base_size = (os.path.getsize(self.sessions_file)
+                         if os.path.exists(self.sessions_file) else 0)
+        except OSError:
+            return
+        if log_size > max(base_size, 4096):
+            self._save_sessions()
+
     def _save_config(self) -> None:
-        """保存配置到文件"""
-        with open(self.config_file, 'w', encoding='utf-8') as f:
-            json.dump(self.config, f, ensure_ascii=False, indent=2)
+        """保存配置到文件，内容与上次写入相同时跳过"""
+        data = _dumps_pretty(self.config)
+        if data == self._last_config_data:
+            return
+        self._ensure_storage_dir()
+        _atomic_write(self.config_file, data)
+        self._last_config_data = data
     
     def update_config(self, study_duration: int = None, short_break: int = None,
                      long_break: int = None, sessions_before_long_break: int = None,
@@ -121,41 +267,99 @@ class StudyTimer:
         if self.running:
             self.stop_session()
             
+        self.sessions  # 确保已加载，_next_id随之就绪
         self.current_session = {
-            "id": len(self.sessions) + 1,
+            "id": self._next_id,
             "subject": subject,
-            "start_time": datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+            "start_time": _now_str(),
+            "start_epoch": int(time.time()),
             "end_time": None,
+            "end_epoch": None,
             "duration": 0,
             "pauses": []
         }
         
         self.running = True
         self.paused = False
-        self.elapsed_seconds = 0
-        
-        # 启动计时器线程
-        self.timer_thread = threading.Thread(target=self._timer_loop)
-        self.timer_thread.daemon = True
-        self.timer_thread.start()
-        
+        self._accumulated = 0.0
+        self._monotonic_start = time.monotonic()
+
+        # 配置在会话开始时一次性固化：是否提醒在这里判定，
+        # 而不是在触发时再查配置
+        if self.config["notification_enabled"]:
+            self._schedule_notification(self.config["study_duration"])
+
         return self.current_session
-    
-    def _timer_loop(self) -> None:
-        """计时器循环"""
-        start_time = time.time()
-        
-        while self.running:
-            if not self.paused:
-                current_time = time.time()
-                self.elapsed_seconds = int(current_time - start_time)
-                
-                # 检查是否达到学习时间
-                if self.elapsed_seconds >= self.config["study_duration"] and self.config["notification_enabled"]:
-                    self._show_notification("学习时间结束", "该休息一下了！")
-                
-            time.sleep(1)
-    
+
+    @property
+    def elapsed_seconds(self) -> int:
+        """当前会话已学习的秒数（不含暂停时间）"""
+        if self.running and not self.paused:
+            return int(self._accumulated + (time.monotonic() - self._monotonic_start))
+        return int(self._accumulated)
+
+    def _schedule_notification(self, delay: float) -> None:
+        """安排一次学习时间到达提醒
+
+        事件循环运行时用asyncio任务等待，不占用线程；
+        在纯同步环境下退回threading.Timer。
+        """
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            loop = None
+
+        if loop is not None:
+            self._notify_timer = loop.create_task(self._notify_after(delay))
+        else:
+            self._notify_timer = threading.Timer(delay, self._on_study_duration_reached)
+            self._notify_timer.daemon = True
+            self._notify_timer.start()
+
+    async def _notify_after(self, delay: float) -> None:
+        """等待指定时长后发出提醒"""
+        try:
+            await asyncio.sleep(delay)
+            # 通知要调起外部命令，放到线程中执行避免阻塞事件循环
+            await asyncio.to_thread(self._on_study_duration_reached)
+        except asyncio.CancelledError:
+            pass
+
+    def _cancel_notification(self) -> None:
+        """取消尚未触发的提醒（Timer和asyncio任务都支持cancel）"""
+        if self._notify_timer is not None:
+            self._notify_timer.cancel()
+            self._notify_timer = None
+
+    def _on_study_duration_reached(self) -> None:
+        """学习时长到达时的回调（是否提醒已在安排时判定）"""
+        self._show_notification("学习时间结束", "该休息一下了！")
+
+    def _resolve_notifier(self):
+        """按当前平台选定通知方式，只在初始化时判断一次
+
+        参数以argv列表传给subprocess，不经过shell，
+        标题/内容里的引号等字符不会被解释。
+        """
+        system = platform.system()
+        if system == "Windows":
+            try:
+                from win10toast import ToastNotifier
+            except ImportError:
+                return None
+            toaster = ToastNotifier()
+            return lambda title, message: toaster.show_toast(
+                title, message, duration=5, threaded=True)
+        if system == "Darwin":  # macOS
+            return lambda title, message: subprocess.run(
+                ["osascript", "-e",
+                 f'display notification "{message}" with title "{title}"'],
+                check=False)
+        if system == "Linux":
+            return lambda title, message: subprocess.run(
+                ["notify-send", title, message], check=False)
+        return None
+
     def _show_notification(self, title: str, message: str) -> None:
         """显示通知
         
@@ -163,17 +367,9 @@ class StudyTimer:
             title: 通知标题
             message: 通知内容
         """
-        system = platform.system()
-        
         try:
-            if system == "Windows":
-                from win10toast import ToastNotifier
-                toaster = ToastNotifier()
-                toaster.show_toast(title, message, duration=5)
-            elif system == "Darwin":  # macOS
-                os.system(f"""osascript -e 'display notification "{message}" with title "{title}"'""")
-            elif system == "Linux":
-                os.system(f"""notify-send "{title}" "{message}" """)
+            if self._notify is not None:
+                self._notify(title, message)
             else:
                 print(f"\n{title}: {message}")
         except Exception:
@@ -188,14 +384,20 @@ class StudyTimer:
         """
         if not self.running or self.paused:
             return self.current_session
-            
+
+        # 结算本段学习时长，暂停期间不再计时
+        self._accumulated += time.monotonic() - self._monotonic_start
+        self._cancel_notification()
+
         self.paused = True
-        pause_time = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        
+        pause_time = _now_str()
+
         if self.current_session:
             self.current_session["pauses"].append({
                 "start_time": pause_time,
-                "end_time": None
+                "start_epoch": int(time.time()),
+                "end_time": None,
+                "end_epoch": None
             })
             
         return self.current_session
@@ -208,14 +410,22 @@ class StudyTimer:
         """
         if not self.running or not self.paused:
             return self.current_session
-            
+
         self.paused = False
-        resume_time = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        self._monotonic_start = time.monotonic()
+
+        # 重新安排剩余时长的提醒
+        remaining = self.config["study_duration"] - self._accumulated
+        if remaining > 0:
+            self._schedule_notification(remaining)
+
+        resume_time = _now_str()
         
         if self.current_session and self.current_session["pauses"]:
             last_pause = self.current_session["pauses"][-1]
             if last_pause["end_time"] is None:
                 last_pause["end_time"] = resume_time
+                last_pause["end_epoch"] = int(time.time())
                 
         return self.current_session
     
@@ -227,37 +437,30 @@ class StudyTimer:
         """
         if not self.running:
             return None
-            
+
+        # 先取已学习时长（不含暂停），再结束会话
+        duration = self.elapsed_seconds
         self.running = False
-        
-        if self.timer_thread:
-            self.timer_thread.join(1)
-            
+        self._accumulated = float(duration)
+        self._cancel_notification()
+
         if self.current_session:
             # 如果会话暂停中，结束最后一个暂停
             if self.paused and self.current_session["pauses"]:
                 last_pause = self.current_session["pauses"][-1]
                 if last_pause["end_time"] is None:
-                    last_pause["end_time"] = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-            
-            # 计算总时长（减去暂停时间）
-            total_seconds = self.elapsed_seconds
-            pause_seconds = 0
-            
-            for pause in self.current_session["pauses"]:
-                if pause["end_time"] is None:
-                    continue
-                    
-                start = datetime.datetime.strptime(pause["start_time"], "%Y-%m-%d %H:%M:%S")
-                end = datetime.datetime.strptime(pause["end_time"], "%Y-%m-%d %H:%M:%S")
-                pause_seconds += (end - start).total_seconds()
-                
-            self.current_session["duration"] = total_seconds - pause_seconds
-            self.current_session["end_time"] = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+                    last_pause["end_time"] = _now_str()
+                    last_pause["end_epoch"] = int(time.time())
+
+            self.current_session["duration"] = duration
+            self.current_session["end_time"] = _now_str()
+            self.current_session["end_epoch"] = int(time.time())
             
             # 保存会话
             self.sessions.append(self.current_session)
-            self._save_sessions()
+            self._next_id += 1
+            self._index_session(self.current_session)
+            self._append_session(self.current_session)
             
             completed_session = self.current_session
             self.current_session = None
@@ -300,8 +503,12 @@ class StudyTimer:
         Returns:
             指定日期的会话列表
         """
-        return [session for session in self.sessions 
-                if session["start_time"].startswith(date)]
+        sessions = self.sessions  # 触发按需加载，同时建好日期列
+        # 会话按开始时间追加，日期列天然有序，二分出区间后整段切片；
+        # 上界补U+FFFF保留旧实现的前缀匹配语义（如只传"2026-08"）
+        lo = bisect.bisect_left(self._session_dates, date)
+        hi = bisect.bisect_right(self._session_dates, date + '￿')
+        return sessions[lo:hi]
     
     def get_sessions_by_subject(self, subject: str) -> List[Dict[str, Any]]:
         """按主题获取会话
@@ -313,8 +520,15 @@ class StudyTimer:
             指定主题的会话列表
         """
         subject = subject.lower()
-        return [session for session in self.sessions 
-                if subject in session["subject"].lower()]
+        sessions = self.sessions  # 触发按需加载，同时建好索引
+        # 先在索引键（去重后的主题集合）上做子串匹配，再按下标取会话，
+        # 不必对每个会话重复lower+扫描
+        hits: List[int] = []
+        for key, indices in self._subject_index.items():
+            if subject in key:
+                hits.extend(indices)
+        hits.sort()
+        return [sessions[i] for i in hits]
     
     def get_statistics(self, days: int = 7) -> Dict[str, Any]:
         """获取学习统计
@@ -328,96 +542,126 @@ class StudyTimer:
         now = datetime.datetime.now()
         start_date = now - datetime.timedelta(days=days-1)
         start_date = start_date.replace(hour=0, minute=0, second=0, microsecond=0)
-        
+
+        # 同一天内对相同参数的重复调用直接返回缓存结果
+        cache_key = (days, start_date, len(self.sessions))
+        if self._stats_cache is not None and self._stats_cache[0] == cache_key:
+            return self._stats_cache[1]
+
         # 按日期分组
         daily_stats = {}
         for i in range(days):
             date = (start_date + datetime.timedelta(days=i)).strftime("%Y-%m-%d")
             daily_stats[date] = {"total_duration": 0, "sessions_count": 0}
-        
+
         # 按主题分组
         subjects = {}
-        
-        # 总计
-        total_duration = 0
-        total_sessions = 0
-        
-        for session in self.sessions:
-            session_start = datetime.datetime.strptime(session["start_time"], "%Y-%m-%d %H:%M:%S")
-            
-            if session_start >= start_date:
-                date = session_start.strftime("%Y-%m-%d")
-                
-                if date in daily_stats:
-                    daily_stats[date]["total_duration"] += session["duration"]
-                    daily_stats[date]["sessions_count"] += 1
-                
-                subject = session["subject"]
-                if subject in subjects:
-                    subjects[subject]["total_duration"] += session["duration"]
-                    subjects[subject]["sessions_count"] += 1
-                else:
-                    subjects[subject] = {
-                        "total_duration": session["duration"],
-                        "sessions_count": 1
-                    }
-                
-                total_duration += session["duration"]
-                total_sessions += 1
-        
-        return {
+
+        # 会话按开始时间有序，bisect直接定位窗口起点，窗口内零解析
+        cutoff = int(start_date.timestamp())
+        lo = bisect.bisect_left(self._session_epochs, cutoff)
+
+        # 窗口内按列连续遍历，总时长直接对紧凑的时长列求和
+        window_durations = self._session_durations[lo:]
+        total_duration = sum(window_durations)
+        total_sessions = len(window_durations)
+
+        for date, duration, subject in zip(self._session_dates[lo:],
+                                           window_durations,
+                                           self._session_subjects[lo:]):
+            if date in daily_stats:
+                daily_stats[date]["total_duration"] += duration
+                daily_stats[date]["sessions_count"] += 1
+
+            if subject in subjects:
+                subjects[subject]["total_duration"] += duration
+                subjects[subject]["sessions_count"] += 1
+            else:
+                subjects[subject] = {
+                    "total_duration": duration,
+                    "sessions_count": 1
+                }
+
+        result = {
             "total_duration": total_duration,
             "total_sessions": total_sessions,
             "daily_stats": daily_stats,
             "subjects": subjects
         }
+        self._stats_cache = (cache_key, result)
+        return result
     
-    def format_duration(self, seconds: int) -> str:
+    # 时长格式按 (有小时<<1)|有分钟 索引选取，免去分支链；
+    # 输出与旧实现完全一致（有小时时分钟总是显示，哪怕为0）
+    _FMT = ("{s}秒", "{m}分钟{s}秒", "{h}小时{m}分钟{s}秒", "{h}小时{m}分钟{s}秒")
+
+    @staticmethod
+    @functools.lru_cache(maxsize=4096)
+    def format_duration(seconds: int) -> str:
         """格式化时长
-        
+
         Args:
             seconds: 秒数
-            
+
         Returns:
             格式化后的时长字符串
         """
-        hours = seconds // 3600
-        minutes = (seconds % 3600) // 60
-        seconds = seconds % 60
-        
-        if hours > 0:
-            return f"{hours}小时{minutes}分钟{seconds}秒"
-        elif minutes > 0:
-            return f"{minutes}分钟{seconds}秒"
-        else:
-            return f"{seconds}秒"
+        seconds = int(seconds)
+        minutes, seconds = divmod(seconds, 60)
+        hours, minutes = divmod(minutes, 60)
+        return StudyTimer._FMT[(hours > 0) << 1 | (minutes > 0)].format(
+            h=hours, m=minutes, s=seconds)
+
+# 两种菜单状态各预先拼成一个字符串，每轮重绘只需一次write
+_MENU_COMMON = (
+    "3. 查看今日学习\n"
+    "4. 查看学习统计\n"
+    "5. 查看所有会话\n"
+    "6. 按主题查找会话\n"
+    "7. 设置\n"
+    "0. 退出\n"
+)
+_MENU_ACTIVE = (
+    "\n===== 学习计时器 =====\n"
+    "当前会话: {subject} ({status}, 已学习 {elapsed})\n"
+    "1. 暂停/恢复会话\n"
+    "2. 结束会话\n"
+) + _MENU_COMMON
+_MENU_IDLE = (
+    "\n===== 学习计时器 =====\n"
+    "没有进行中的会话\n"
+    "1. 开始新会话\n"
+) + _MENU_COMMON
+_MENU_SETTINGS = (
+    "\n===== 设置 =====\n"
+    "1. 修改学习时长\n"
+    "2. 修改休息时长\n"
+    "3. 修改通知设置\n"
+    "0. 返回\n"
+)
+# 按总时长排序的key函数建一次反复使用
+_BY_DURATION = itemgetter("total_duration")
 
-def interactive_mode():
-    """交互式学习计时器"""
+async def interactive_mode():
+    """交互式学习计时器（asyncio驱动，阻塞的stdin读取放在线程中）"""
     timer = StudyTimer()
+
+    async def ainput(prompt: str = "") -> str:
+        return await asyncio.to_thread(input, prompt)
     
     while True:
-        print("\n===== 学习计时器 =====")
-        
         current_session = timer.get_current_session()
         if current_session:
-            status = "暂停中" if current_session["status"] == "paused" else "进行中"
-            elapsed = timer.format_duration(current_session["elapsed_seconds"])
-            print(f"当前会话: {current_session['subject']} ({status}, 已学习 {elapsed})")
-            print("1. 暂停/恢复会话")
-            print("2. 结束会话")
+            menu = _MENU_ACTIVE.format(
+                subject=current_session["subject"],
+                status="暂停中" if current_session["status"] == "paused" else "进行中",
+                elapsed=timer.format_duration(current_session["elapsed_seconds"]))
         else:
-            print("没有进行中的会话")
-            print("1. 开始新会话")
-        
-        print("3. 查看今日学习")
-        print("4. 查看学习统计")
-        print("5. 查看所有会话")
-        print("6. 按主题查找会话")
-        print("7. 设置")
-        print("0. 退出")
+            menu = _MENU_IDLE
+        sys.stdout.write(menu)
+        sys.stdout.flush()
         
-        choice = input("\n请选择操作: ")
+        choice = await ainput("\n请选择操作: ")
         
         if choice == "1":
             if current_session:
@@ -428,7 +672,7 @@ def interactive_mode():
                     timer.pause_session()
                     print("会话已暂停")
             else:
-                subject = input("请输入学习主题: ")
+                subject = await ainput("请输入学习主题: ")
                 timer.start_session(subject)
                 print(f"已开始 '{subject}' 学习会话")
                 
@@ -455,7 +699,7 @@ def interactive_mode():
                     print(f"{i+1}. {session['subject']}: {start_time} - {end_time}, 时长 {duration}")
                     
         elif choice == "4":
-            days = input("请输入统计天数 (默认7天): ")
+            days = await ainput("请输入统计天数 (默认7天): ")
             try:
                 days = int(days) if days else 7
                 stats = timer.get_statistics(days)
@@ -471,8 +715,8 @@ def interactive_mode():
                     print(f"{date}: {time_str} ({data['sessions_count']}个会话)")
                 
                 print("\n按主题统计:")
-                sorted_subjects = sorted(stats["subjects"].items(), 
-                                        key=lambda x: x[1]["total_duration"], 
+                sorted_subjects = sorted(stats["subjects"].items(),
+                                        key=lambda item: _BY_DURATION(item[1]),
                                         reverse=True)
                 for subject, data in sorted_subjects:
                     time_str = timer.format_duration(data["total_duration"])
@@ -495,7 +739,7 @@ def interactive_mode():
                     print(f"... 还有 {len(sessions) - 10} 个会话未显示")
                     
         elif choice == "6":
-            subject = input("请输入要查找的主题: ")
+            subject = await ainput("请输入要查找的主题: ")
             sessions = timer.get_sessions_by_subject(subject)
             
             if not sessions:
@@ -510,16 +754,13 @@ def interactive_mode():
                     print(f"{i+1}. [{session['start_time']}] {session['subject']}, 时长 {duration}")
                     
         elif choice == "7":
-            print("\n===== 设置 =====")
-            print("1. 修改学习时长")
-            print("2. 修改休息时长")
-            print("3. 修改通知设置")
-            print("0. 返回")
+            sys.stdout.write(_MENU_SETTINGS)
+            sys.stdout.flush()
             
-            setting_choice = input("\n请选择设置: ")
+            setting_choice = await ainput("\n请选择设置: ")
             
             if setting_choice == "1":
-                minutes = input("请输入学习时长(分钟): ")
+                minutes = await ainput("请输入学习时长(分钟): ")
                 try:
                     minutes = int(minutes)
                     timer.update_config(study_duration=minutes * 60)
@@ -528,9 +769,9 @@ def interactive_mode():
                     print("无效的时间")
                     
             elif setting_choice == "2":
-                short_break = input("请输入短休息时长(分钟): ")
-                long_break = input("请输入长休息时长(分钟): ")
-                sessions = input("请输入长休息前的学习次数: ")
+                short_break = await ainput("请输入短休息时长(分钟): ")
+                long_break = await ainput("请输入长休息时长(分钟): ")
+                sessions = await ainput("请输入长休息前的学习次数: ")
                 
                 try:
                     config_updates = {}
@@ -547,7 +788,7 @@ def interactive_mode():
                     print("无效的时间")
                     
             elif setting_choice == "3":
-                enabled = input("是否启用通知 (y/n): ").lower()
+                enabled = (await ainput("是否启用通知 (y/n): ")).lower()
                 if enabled in ("y", "n"):
                     timer.update_config(notification_enabled=(enabled == "y"))
                     status = "启用" if enabled == "y" else "禁用"
@@ -555,7 +796,7 @@ def interactive_mode():
                     
         elif choice == "0":
             if timer.get_current_session():
-                confirm = input("有正在进行的会话，确定要退出吗? (y/n): ").lower()
+                confirm = (await ainput("有正在进行的会话，确定要退出吗? (y/n): ")).lower()
                 if confirm != "y":
                     continue
                     
@@ -568,4 +809,4 @@ def interactive_mode():
             print("无效的选择，请重试")
 
 if __name__ == "__main__":
-    interactive_mode() 
\ No newline at end of file
+    asyncio.run(interactive_mode())
@@ -1,9 +1,75 @@
 import os
+import re
 import json
+import string
+import mmap
+import math
+import time
+import heapq
+import atexit
 import random
 import datetime
+from collections import defaultdict
 from typing import List, Dict, Any, Tuple
 
+try:
+    # 行编辑/历史记录，同时让input()走缓冲的readline路径
+    import readline  # noqa: F401
+except ImportError:
+    pass
+
+try:
+    # orjson的C序列化比stdlib json快数倍
+    import orjson
+    _dumps = orjson.dumps
+    def _dumps_pretty(obj) -> bytes:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+    _loads = orjson.loads
+except ImportError:
+    def _dumps(obj) -> bytes:
+        return json.dumps(obj, ensure_ascii=False).encode('utf-8')
+    def _dumps_pretty(obj) -> bytes:
+        return json.dumps(obj, ensure_ascii=False, indent=2).encode('utf-8')
+    def _loads(data):
+        # stdlib json不认memoryview，退化成一次拷贝
+        if isinstance(data, memoryview):
+            data = data.tobytes()
+        return json.loads(data)
+
+# \w+对中英文都适用：英文按单词切，中文按连续汉字段切
+_TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+
+# 判卷前的归一化：去掉中英文标点并小写，含义按分隔符拆成多个备选答案
+_PUNCT_TRANS = str.maketrans({c: None for c in string.punctuation + "，。；、！？"})
+_ALT_SPLIT_RE = re.compile(r"[;,/；，、]")
+
+def _norm_answer(text: str) -> str:
+    return text.translate(_PUNCT_TRANS).lower().strip()
+
+def _atomic_write_json(path: str, data: bytes) -> None:
+    """先写临时文件再os.replace，中途崩溃不会留下半截JSON"""
+    tmp_path = path + ".tmp"
+    with open(tmp_path, 'wb') as f:
+        f.write(data)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+def _ensure_lc(word: Dict[str, Any]) -> None:
+    """给词条加上小写影子字段，搜索时不再反复lower()"""
+    word["_word_lc"] = word["word"].lower()
+    word["_meaning_lc"] = word["meaning"].lower()
+    word["_example_lc"] = word["example"].lower()
+    word["_tags_lc"] = [tag.lower() for tag in word["tags"]]
+    # 测验判卷用的归一化备选答案集合
+    word["_answers"] = {_norm_answer(alt)
+                        for alt in _ALT_SPLIT_RE.split(word["meaning"])
+                        if alt.strip()}
+
+def _parse_ts(text: str) -> float:
+    """把"%Y-%m-%d %H:%M:%S"字符串解析成epoch秒"""
+    return datetime.datetime.strptime(text, "%Y-%m-%d %H:%M:%S").timestamp()
+
 class VocabularyTrainer:
     """单词记忆助手，用于学习和记忆单词"""
     
@@ -15,9 +81,35 @@ class VocabularyTrainer:
         """
         self.storage_path = storage_path
         self.words_file = os.path.join(storage_path, "words.json")
+        # 历史记录为逐行追加的JSONL；history.json仅作旧版迁移来源
         self.history_file = os.path.join(storage_path, "history.json")
+        self.history_log_file = os.path.join(storage_path, "history.jsonl")
+        self._history_fp = None
+        self._pending_history: List[Dict[str, Any]] = []
         self.words = []
         self.history = []
+        # id/小写单词 -> 词条的索引，查找与查重都是O(1)
+        self._by_id: Dict[int, Dict[str, Any]] = {}
+        self._by_word_lower: Dict[str, Dict[str, Any]] = {}
+        # 标签 -> 词条列表的索引，按标签查询为O(结果数)
+        self._by_tag: Dict[str, List[Dict[str, Any]]] = defaultdict(list)
+        # token -> 词条id集合的倒排索引，惰性重建（增删改只置脏标记）
+        self._inverted: Dict[str, set] = {}
+        self._inv_dirty = True
+        # (next_review_ts, id)最小堆：取到期单词无需全表扫描；
+        # 时间戳更新后旧堆项不删除，弹出时按当前值懒过滤
+        self._review_heap: List[Tuple[float, int]] = []
+        # 统计聚合随复习增量更新，查看统计时无需重扫全部历史
+        self._daily_stats: Dict[str, Dict[str, int]] = defaultdict(
+            lambda: {"total": 0, "correct": 0})
+        self._total_reviews = 0
+        self._total_correct = 0
+        # 单调递增的下一个单词id，删除后也不复用
+        self._next_id = 1
+        # 脏标记：修改只改内存，flush()时才落盘
+        self._words_dirty = False
+        self._history_dirty = False
+        atexit.register(self.flush)
         
         # 确保存储目录存在
         if not os.path.exists(storage_path):
@@ -28,33 +120,100 @@ class VocabularyTrainer:
     
     def _load_data(self) -> None:
         """从文件加载单词和历史记录"""
-        # 加载单词
-        if os.path.exists(self.words_file):
+        # 加载单词：mmap让解析器直接读页缓存，省掉一次整文件拷贝
+        if os.path.exists(self.words_file) and os.path.getsize(self.words_file) > 0:
             try:
-                with open(self.words_file, 'r', encoding='utf-8') as f:
-                    self.words = json.load(f)
-            except json.JSONDecodeError:
+                with open(self.words_file, 'rb') as f:
+                    with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+                        view = memoryview(data)
+                        try:
+                            self.words = _loads(view)
+                        finally:
+                            view.release()
+            except ValueError:
                 print("单词文件损坏，创建新的单词文件")
                 self.words = []
         
-        # 加载历史记录
-        if os.path.exists(self.history_file):
+        # 旧版history.json一次性迁移到追加式日志
+        if os.path.exists(self.history_file) and not os.path.exists(self.history_log_file):
             try:
                 with open(self.history_file, 'r', encoding='utf-8') as f:
-                    self.history = json.load(f)
+                    legacy_history = json.load(f)
             except json.JSONDecodeError:
                 print("历史记录文件损坏，创建新的历史记录文件")
-                self.history = []
+                legacy_history = []
+            with open(self.history_log_file, 'wb') as f:
+                f.writelines(_dumps(entry) + b'\n' for entry in legacy_history)
+            os.rename(self.history_file, self.history_file + ".bak")
+
+        # 加载历史记录
+        if os.path.exists(self.history_log_file):
+            with open(self.history_log_file, 'rb') as f:
+                for line in f:
+                    line = line.strip()
+                    if not line:
+                        continue
+                    try:
+                        self.history.append(_loads(line))
+                    except ValueError:
+                        # 崩溃留下的半截末行，跳过即可，不丢整个历史
+                        continue
+
+        for entry in self.history:
+            self._record_stats(entry["reviewed_at"][:10], entry["is_correct"])
+
+        for word in self.words:
+            self._by_id[word["id"]] = word
+            self._by_word_lower[word["word"].lower()] = word
+            for tag in word["tags"]:
+                self._by_tag[tag].append(word)
+            # 旧版数据没有记忆模型字段，补默认值
+            word.setdefault("stability", 1.0)
+            word.setdefault("difficulty", 5.0)
+            _ensure_lc(word)
+            # 下次复习时间只解析这一次，之后用epoch浮点数比较
+            word["_next_review_ts"] = (
+                _parse_ts(word["next_review"]) if word["next_review"] else 0.0)
+        self._next_id = max(
+            (word["id"] for word in self.words), default=0) + 1
+        self._review_heap = [(word["_next_review_ts"], word["id"])
+                             for word in self.words]
+        heapq.heapify(self._review_heap)
+        self._inv_dirty = True
     
+    def _record_stats(self, date: str, is_correct: bool) -> None:
+        """把一次复习计入每日与总量聚合"""
+        day = self._daily_stats[date]
+        day["total"] += 1
+        day["correct"] += is_correct
+        self._total_reviews += 1
+        self._total_correct += is_correct
+
     def _save_words(self) -> None:
-        """保存单词到文件"""
-        with open(self.words_file, 'w', encoding='utf-8') as f:
-            json.dump(self.words, f, ensure_ascii=False, indent=2)
+        """保存单词到文件（下划线开头的运行时字段不落盘）"""
+        serializable = [{key: value for key, value in word.items()
+                         if not key.startswith("_")}
+                        for word in self.words]
+        _atomic_write_json(self.words_file, _dumps_pretty(serializable))
+        self._words_dirty = False
     
     def _save_history(self) -> None:
-        """保存历史记录到文件"""
-        with open(self.history_file, 'w', encoding='utf-8') as f:
-            json.dump(self.history, f, ensure_ascii=False, indent=2)
+        """把新增的历史记录逐行追加到日志文件，写入量与总历史数无关"""
+        if self._history_fp is None:
+            # 64KB缓冲：批量flush时多条记录合成更少的write()系统调用
+            self._history_fp = open(self.history_log_file, 'ab', buffering=64 * 1024)
+        self._history_fp.writelines(
+            _dumps(entry) + b'\n' for entry in self._pending_history)
+        self._history_fp.flush()
+        self._pending_history.clear()
+        self._history_dirty = False
+
+    def flush(self) -> None:
+        """把内存中未保存的修改写入磁盘"""
+        if self._words_dirty:
+            self._save_words()
+        if self._history_dirty:
+            self._save_history()
     
     def add_word(self, word: str, meaning: str, example: str = "", tags: List[str] = None) -> Dict[str, Any]:
         """添加新单词
@@ -72,25 +231,41 @@ class VocabularyTrainer:
             tags = []
             
         # 检查单词是否已存在
-        for existing_word in self.words:
-            if existing_word["word"].lower() == word.lower():
-                return existing_word
+        existing_word = self._by_word_lower.get(word.lower())
+        if existing_word is not None:
+            return existing_word
         
+        # 取一次时间，isoformat比strftime更快且格式相同
+        now = datetime.datetime.now()
+        now_s = now.isoformat(sep=" ", timespec="seconds")
         word_entry = {
-            "id": len(self.words) + 1,
+            "id": self._next_id,
             "word": word,
             "meaning": meaning,
             "example": example,
             "tags": tags,
-            "created_at": datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+            "created_at": now_s,
             "review_count": 0,
             "correct_count": 0,
+            "stability": 1.0,
+            "difficulty": 5.0,
             "last_reviewed": None,
-            "next_review": datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+            "next_review": now_s,
+            "_next_review_ts": now.timestamp()
         }
         
+        self._next_id += 1
+        _ensure_lc(word_entry)
         self.words.append(word_entry)
-        self._save_words()
+        self._by_id[word_entry["id"]] = word_entry
+        self._by_word_lower[word.lower()] = word_entry
+        for tag in tags:
+            self._by_tag[tag].append(word_entry)
+        heapq.heappush(self._review_heap,
+                       (word_entry["_next_review_ts"], word_entry["id"]))
+        self._inv_dirty = True
+        self._words_dirty = True
+        self.flush()
         return word_entry
     
     def get_all_words(self) -> List[Dict[str, Any]]:
@@ -110,8 +285,18 @@ class VocabularyTrainer:
         Returns:
             包含指定标签的单词列表
         """
-        return [word for word in self.words if tag in word["tags"]]
+        return list(self._by_tag.get(tag, ()))
     
+    def _rebuild_inverted(self) -> None:
+        """重建token倒排索引（只在索引脏时执行一次全量扫描）"""
+        self._inverted = {}
+        for word in self.words:
+            text = " ".join((word["word"], word["meaning"], word["example"],
+                             " ".join(word["tags"])))
+            for token in _TOKEN_RE.findall(text.lower()):
+                self._inverted.setdefault(token, set()).add(word["id"])
+        self._inv_dirty = False
+
     def search_words(self, query: str) -> List[Dict[str, Any]]:
         """搜索单词
         
@@ -122,13 +307,33 @@ class VocabularyTrainer:
             匹配的单词列表
         """
         query = query.lower()
+
+        if self._inv_dirty:
+            self._rebuild_inverted()
+
+        # 用查询词的token在倒排索引里圈定候选，再做子串确认；
+        # 查询本身切不出token时退回全量扫描（如纯标点）
+        tokens = _TOKEN_RE.findall(query)
+        if tokens:
+            candidate_ids = None
+            for token in tokens:
+                # 前缀/子串查询时token不一定是完整索引键，
+                # 在键集合（去重后远小于全表）上匹配
+                matched = set()
+                for key, ids in self._inverted.items():
+                    if token in key:
+                        matched |= ids
+                candidate_ids = matched if candidate_ids is None else candidate_ids & matched
+            candidates = [self._by_id[i] for i in sorted(candidate_ids)]
+        else:
+            candidates = self.words
+
         results = []
-        
-        for word in self.words:
-            if (query in word["word"].lower() or 
-                query in word["meaning"].lower() or
-                query in word["example"].lower() or
-                any(query in tag.lower() for tag in word["tags"])):
+        for word in candidates:
+            if (query in word["_word_lc"] or
+                query in word["_meaning_lc"] or
+                query in word["_example_lc"] or
+                any(query in tag for tag in word["_tags_lc"])):
                 results.append(word)
                 
         return results
@@ -142,13 +347,17 @@ class VocabularyTrainer:
         Returns:
             是否成功删除
         """
-        for i, word in enumerate(self.words):
-            if word["id"] == word_id:
-                del self.words[i]
-                self._save_words()
-                return True
-                
-        return False
+        word = self._by_id.pop(word_id, None)
+        if word is None:
+            return False
+        self._by_word_lower.pop(word["word"].lower(), None)
+        self.words.remove(word)
+        for tag in word["tags"]:
+            self._by_tag[tag].remove(word)
+        self._inv_dirty = True
+        self._words_dirty = True
+        self.flush()
+        return True
     
     def update_word(self, word_id: int, word: str = None, meaning: str = None, 
                    example: str = None, tags: List[str] = None) -> Dict[str, Any]:
@@ -164,21 +373,31 @@ class VocabularyTrainer:
         Returns:
             更新后的单词，如果单词不存在则返回None
         """
-        for word_entry in self.words:
-            if word_entry["id"] == word_id:
-                if word is not None:
-                    word_entry["word"] = word
-                if meaning is not None:
-                    word_entry["meaning"] = meaning
-                if example is not None:
-                    word_entry["example"] = example
-                if tags is not None:
-                    word_entry["tags"] = tags
-                    
-                self._save_words()
-                return word_entry
-                
-        return None
+        word_entry = self._by_id.get(word_id)
+        if word_entry is None:
+            return None
+
+        if word is not None:
+            # 单词文本变了要同步改查重索引的键
+            self._by_word_lower.pop(word_entry["word"].lower(), None)
+            word_entry["word"] = word
+            self._by_word_lower[word.lower()] = word_entry
+        if meaning is not None:
+            word_entry["meaning"] = meaning
+        if example is not None:
+            word_entry["example"] = example
+        if tags is not None:
+            for tag in word_entry["tags"]:
+                self._by_tag[tag].remove(word_entry)
+            word_entry["tags"] = tags
+            for tag in tags:
+                self._by_tag[tag].append(word_entry)
+
+        _ensure_lc(word_entry)
+        self._inv_dirty = True
+        self._words_dirty = True
+        self.flush()
+        return word_entry
     
     def get_words_for_review(self, count: int = 10) -> List[Dict[str, Any]]:
         """获取需要复习的单词
@@ -189,21 +408,25 @@ class VocabularyTrainer:
         Returns:
             需要复习的单词列表
         """
-        now = datetime.datetime.now()
+        # 从最小堆弹出到期的条目；时间戳已变或单词已删的旧项直接丢弃，
+        # 仍然有效的弹出后再压回（未复习的到期单词要留在队列里）
+        now_ts = time.time()
         due_words = []
-        
-        for word in self.words:
-            if word["next_review"] is None:
-                due_words.append(word)
-            else:
-                next_review = datetime.datetime.strptime(word["next_review"], "%Y-%m-%d %H:%M:%S")
-                if next_review <= now:
-                    due_words.append(word)
+        valid_entries = []
+        while self._review_heap and self._review_heap[0][0] <= now_ts:
+            entry = heapq.heappop(self._review_heap)
+            word = self._by_id.get(entry[1])
+            if word is None or word["_next_review_ts"] != entry[0]:
+                continue
+            due_words.append(word)
+            valid_entries.append(entry)
+        for entry in valid_entries:
+            heapq.heappush(self._review_heap, entry)
         
         # 如果没有到期的单词，返回最近复习的单词
         if not due_words and self.words:
-            sorted_words = sorted(self.words, key=lambda w: w["review_count"])
-            return sorted_words[:count]
+            return heapq.nsmallest(count, self.words,
+                                   key=lambda w: w["review_count"])
             
         # 随机选择指定数量的单词
         random.shuffle(due_words)
@@ -216,40 +439,51 @@ class VocabularyTrainer:
             word_id: 单词ID
             is_correct: 是否正确回答
         """
-        for word in self.words:
-            if word["id"] == word_id:
-                word["review_count"] += 1
-                if is_correct:
-                    word["correct_count"] += 1
-                
-                # 更新最后复习时间
-                now = datetime.datetime.now()
-                word["last_reviewed"] = now.strftime("%Y-%m-%d %H:%M:%S")
-                
-                # 根据记忆曲线计算下次复习时间
-                # 使用简化的艾宾浩斯遗忘曲线
-                if is_correct:
-                    # 正确回答，增加间隔
-                    interval_days = min(30, word["review_count"] * 2)
-                else:
-                    # 错误回答，减少间隔
-                    interval_days = 1
-                
-                next_review = now + datetime.timedelta(days=interval_days)
-                word["next_review"] = next_review.strftime("%Y-%m-%d %H:%M:%S")
-                
-                # 记录历史
-                history_entry = {
-                    "word_id": word_id,
-                    "word": word["word"],
-                    "is_correct": is_correct,
-                    "reviewed_at": now.strftime("%Y-%m-%d %H:%M:%S")
-                }
-                self.history.append(history_entry)
-                
-                self._save_words()
-                self._save_history()
-                break
+        word = self._by_id.get(word_id)
+        if word is None:
+            return
+
+        word["review_count"] += 1
+        if is_correct:
+            word["correct_count"] += 1
+
+        # 时间只取一次、只格式化一次，三处复用同一个字符串
+        now = datetime.datetime.now()
+        now_s = now.isoformat(sep=" ", timespec="seconds")
+        word["last_reviewed"] = now_s
+
+        # SM2/FSRS风格的稳定度模型：答对间隔几何增长，答错稳定度减半；
+        # difficulty抑制难词的增长速度
+        if is_correct:
+            word["difficulty"] = max(1.0, word["difficulty"] - 0.1)
+            word["stability"] *= 1.0 + ((2.5 - 0.1 * word["difficulty"])
+                                        * math.exp(-word["stability"] / 30))
+        else:
+            word["difficulty"] = min(10.0, word["difficulty"] + 0.8)
+            word["stability"] = max(1.0, word["stability"] * 0.5)
+        # 少量随机抖动，避免同批单词永远同一天到期
+        interval_days = max(1, int(round(word["stability"])
+                                   * random.uniform(0.95, 1.05)))
+
+        next_review = now + datetime.timedelta(days=interval_days)
+        word["next_review"] = next_review.isoformat(sep=" ", timespec="seconds")
+        word["_next_review_ts"] = next_review.timestamp()
+        heapq.heappush(self._review_heap, (word["_next_review_ts"], word_id))
+
+        # 记录历史
+        history_entry = {
+            "word_id": word_id,
+            "word": word["word"],
+            "is_correct": is_correct,
+            "reviewed_at": now_s
+        }
+        self.history.append(history_entry)
+        self._pending_history.append(history_entry)
+        self._record_stats(history_entry["reviewed_at"][:10], is_correct)
+
+        # 测验过程中只标脏，由quiz_mode结束时统一flush
+        self._words_dirty = True
+        self._history_dirty = True
     
     def get_review_history(self, limit: int = 50) -> List[Dict[str, Any]]:
         """获取复习历史
@@ -260,7 +494,8 @@ class VocabularyTrainer:
         Returns:
             复习历史记录
         """
-        return sorted(self.history, key=lambda h: h["reviewed_at"], reverse=True)[:limit]
+        # 历史按时间追加，天然有序，最新的就是末尾limit条
+        return list(reversed(self.history[-limit:]))
     
     def get_statistics(self) -> Dict[str, Any]:
         """获取学习统计
@@ -268,31 +503,18 @@ class VocabularyTrainer:
         Returns:
             学习统计信息
         """
-        total_words = len(self.words)
-        total_reviews = sum(word["review_count"] for word in self.words)
-        total_correct = sum(word["correct_count"] for word in self.words)
-        
+        # 聚合在record_review时增量维护，这里只读
         accuracy = 0
-        if total_reviews > 0:
-            accuracy = (total_correct / total_reviews) * 100
-            
-        # 计算每日学习情况
-        daily_stats = {}
-        for entry in self.history:
-            date = entry["reviewed_at"].split()[0]
-            if date not in daily_stats:
-                daily_stats[date] = {"total": 0, "correct": 0}
-            
-            daily_stats[date]["total"] += 1
-            if entry["is_correct"]:
-                daily_stats[date]["correct"] += 1
-        
+        if self._total_reviews > 0:
+            accuracy = (self._total_correct / self._total_reviews) * 100
+
         return {
-            "total_words": total_words,
-            "total_reviews": total_reviews,
-            "total_correct": total_correct,
+            "total_words": len(self.words),
+            "total_reviews": self._total_reviews,
+            "total_correct": self._total_correct,
             "accuracy": accuracy,
-            "daily_stats": daily_stats
+            "daily_stats": {date: dict(day)
+                            for date, day in self._daily_stats.items()}
         }
 
 def quiz_mode(trainer: VocabularyTrainer, count: int = 5) -> None:
@@ -317,7 +539,8 @@ def quiz_mode(trainer: VocabularyTrainer, count: int = 5) -> None:
         
         user_answer = input("请输入单词含义: ").strip()
         
-        is_correct = user_answer.lower() in word["meaning"].lower()
+        # 与归一化后的备选含义整体比对，"a"之类的碎片不再误判为正确
+        is_correct = _norm_answer(user_answer) in word["_answers"]
         
         if is_correct:
             print("✓ 正确!")
@@ -330,26 +553,33 @@ def quiz_mode(trainer: VocabularyTrainer, count: int = 5) -> None:
             
         trainer.record_review(word["id"], is_correct)
     
+    # 整个测验只落盘一次
+    trainer.flush()
+    
     print(f"\n测验完成! 得分: {correct_count}/{len(words)} ({correct_count/len(words)*100:.1f}%)")
 
+# 菜单预先拼成一个字符串，每轮只需一次写出
+_MENU = (
+    "\n===== 单词记忆助手 =====\n"
+    "1. 添加单词\n"
+    "2. 查看所有单词\n"
+    "3. 搜索单词\n"
+    "4. 按标签查看单词\n"
+    "5. 开始单词测验\n"
+    "6. 查看学习统计\n"
+    "7. 查看复习历史\n"
+    "8. 更新单词\n"
+    "9. 删除单词\n"
+    "0. 退出\n"
+    "\n请选择操作: "
+)
+
 def interactive_mode():
     """交互式单词记忆助手"""
     trainer = VocabularyTrainer()
     
     while True:
-        print("\n===== 单词记忆助手 =====")
-        print("1. 添加单词")
-        print("2. 查看所有单词")
-        print("3. 搜索单词")
-        print("4. 按标签查看单词")
-        print("5. 开始单词测验")
-        print("6. 查看学习统计")
-        print("7. 查看复习历史")
-        print("8. 更新单词")
-        print("9. 删除单词")
-        print("0. 退出")
-        
-        choice = input("\n请选择操作: ")
+        choice = input(_MENU)
         
         if choice == "1":
             word = input("请输入单词: ")